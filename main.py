@@ -1,55 +1,326 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from datetime import datetime,timezone
-
-from typing import Dict, List
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple
 from uuid import UUID, uuid4
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Response
 from fastapi import Query
-from typing import Optional
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from typing import Any, Optional, Type, get_args
 
 from models.student import StudentCreate, StudentRead, StudentUpdate
 from models.course import CourseCreate, CourseRead, CourseUpdate
+from utils.clock import now_utc
+from utils.columns import VECTORIZE_MIN_ROWS, SnapshotColumns
+from utils.index import EMPTY, add_posting, intersect, remove_posting, trigrams
+from utils.predicate import FusedFilter
 
 port = int(os.environ.get("FASTAPIPORT", 8000))
 
 # -----------------------------------------------------------------------------
-# Fake in-memory "databases"
+# Fake in-memory "databases", keyed by `UUID.int` (ints hash and compare in C)
 # -----------------------------------------------------------------------------
-students: Dict[UUID, StudentRead] = {}
-courses: Dict[UUID, CourseRead] = {}
+students: Dict[int, StudentRead] = {}
+courses: Dict[int, CourseRead] = {}
+
+# Immutable, insertion-ordered views of the stores for the list endpoints.
+# Writers swap in a new tuple (a single atomic assignment); readers iterate
+# whatever snapshot they picked up without copying the dict.
+_students_snapshot: Tuple[StudentRead, ...] = ()
+_courses_snapshot: Tuple[CourseRead, ...] = ()
+
+# Position of every record in its store's snapshot. The index path reads
+# its candidates back through these, so both list paths return snapshot
+# order; creation timestamps can tie, or step back with the wall clock.
+student_positions: Dict[int, int] = {}
+course_positions: Dict[int, int] = {}
+
+# One write lock per store, held by every writer across its existence check
+# and the update of the store plus everything derived from it (snapshot,
+# shadows, indexes, documents, encoded bodies). No write path awaits today,
+# so the lock never contends; it keeps writes atomic if one ever does.
+# Reads take no lock.
+_student_writes = asyncio.Lock()
+_course_writes = asyncio.Lock()
+
+# JSON-ready documents of every stored record, dumped once per write, so the
+# list endpoints hand plain dicts straight to orjson without touching Pydantic.
+student_docs: Dict[int, Dict[str, Any]] = {}
+course_docs: Dict[int, Dict[str, Any]] = {}
+
+# Encoded GET-by-id bodies, filled on first read and dropped on every write.
+_student_json: Dict[int, bytes] = {}
+_course_json: Dict[int, bytes] = {}
+
+
+def _json_response(cache: Dict[int, bytes], docs: Dict[int, Dict[str, Any]], key: int) -> Response:
+    body = cache.get(key)
+    if body is None:
+        body = cache[key] = orjson.dumps(docs[key])
+    return Response(content=body, media_type="application/json")
+
+
+def _replace(snapshot: tuple, position: int, new: Any) -> tuple:
+    return snapshot[:position] + (new,) + snapshot[position + 1:]
+
+
+def _remove(snapshot: tuple, positions: Dict[int, int], key: int) -> tuple:
+    """`snapshot` without the record at `key`, renumbering `positions` to match."""
+    position = positions.pop(key)
+    remaining = snapshot[:position] + snapshot[position + 1:]
+    for index in range(position, len(remaining)):
+        positions[remaining[index].id.int] = index
+    return remaining
+
+
+def _in_snapshot_order(snapshot: tuple, positions: Dict[int, int], keys: Set[int]) -> Iterable[Any]:
+    """Records at `keys`, in the order they appear in `snapshot`."""
+    return map(snapshot.__getitem__, sorted(map(positions.__getitem__, keys)))
+
+# -----------------------------------------------------------------------------
+# Lowercased shadows of the filterable fields, computed once per write
+# -----------------------------------------------------------------------------
+class CourseLower(NamedTuple):
+    department_code: str
+    title: str
+    instructor: str
+    days: str
+    start_time: str
+    end_time: str
+
+
+class StudentLower(NamedTuple):
+    uni: str
+    first_name: str
+    last_name: str
+    major: str
+    grade: str
+    course_depts: FrozenSet[str]
+    course_instructors: FrozenSet[str]
+
+
+course_lower: Dict[int, CourseLower] = {}
+student_lower: Dict[int, StudentLower] = {}
+
+
+# Reverse indexes over the embedded courses: lowercased value -> student IDs
+students_by_dept: Dict[str, Set[int]] = {}
+students_by_instructor: Dict[str, Set[int]] = {}
+
+
+def _derive_student(student: StudentRead) -> Tuple[StudentLower, Dict[str, Any]]:
+    """Shadow and JSON document of `student`, computed without touching shared state.
+
+    Writers call this before publishing anything, so a failure here leaves
+    the store and its indexes as they were.
+    """
+    lc = StudentLower(
+        uni=student.uni.lower(),
+        first_name=student.first_name.lower(),
+        last_name=student.last_name.lower(),
+        major=student.major.lower(),
+        grade=student.grade.lower(),
+        course_depts=frozenset(c.department_code.lower() for c in student.courses),
+        course_instructors=frozenset(c.instructor.lower() for c in student.courses),
+    )
+    return lc, student.model_dump(mode="json")
+
+
+def _index_student(student: StudentRead, lc: StudentLower, doc: Dict[str, Any]) -> None:
+    """Publish the derived state of `student`, moving only its changed course postings."""
+    key = student.id.int
+    student_docs[key] = doc
+    _student_json.pop(key, None)
+    old = student_lower.get(key)
+    student_lower[key] = lc
+    old_depts = old.course_depts if old is not None else EMPTY
+    old_instructors = old.course_instructors if old is not None else EMPTY
+    for dept in old_depts - lc.course_depts:
+        remove_posting(students_by_dept, dept, key)
+    for dept in lc.course_depts - old_depts:
+        add_posting(students_by_dept, dept, key)
+    for name in old_instructors - lc.course_instructors:
+        remove_posting(students_by_instructor, name, key)
+    for name in lc.course_instructors - old_instructors:
+        add_posting(students_by_instructor, name, key)
+
+
+def _unindex_student(key: int) -> None:
+    del student_docs[key]
+    _student_json.pop(key, None)
+    lc = student_lower.pop(key)
+    for dept in lc.course_depts:
+        remove_posting(students_by_dept, dept, key)
+    for name in lc.course_instructors:
+        remove_posting(students_by_instructor, name, key)
+
+
+# Filters left after the index lookups, fused into a single predicate per request
+_student_filter = FusedFilter(
+    {
+        "uni": "uni == lc.uni",
+        "first_name": "first_name == lc.first_name",
+        "last_name": "last_name == lc.last_name",
+        "major": "major == lc.major",
+        "grade": "grade == lc.grade",
+        "email": "email == r.email",
+        "phone": "phone == r.phone",
+        "birth_date": "birth_date == str(r.birth_date)",
+    },
+    {"_lower": student_lower},
+    prelude="lc := _lower[r.id.int]",
+)
+
+# Column view of the student snapshot, scanned instead when no index applies and the store is large
+_student_columns = SnapshotColumns({
+    "uni": lambda r: student_lower[r.id.int].uni,
+    "first_name": lambda r: student_lower[r.id.int].first_name,
+    "last_name": lambda r: student_lower[r.id.int].last_name,
+    "major": lambda r: student_lower[r.id.int].major,
+    "grade": lambda r: student_lower[r.id.int].grade,
+    "email": lambda r: r.email,
+})
+
+# -----------------------------------------------------------------------------
+# Course filter indexes: lowercased value (or trigram) -> course IDs
+# -----------------------------------------------------------------------------
+courses_by_dept: Dict[str, Set[int]] = {}
+courses_by_code: Dict[str, Set[int]] = {}
+courses_by_start: Dict[str, Set[int]] = {}
+courses_by_end: Dict[str, Set[int]] = {}
+courses_by_title: Dict[str, Set[int]] = {}
+courses_by_instructor: Dict[str, Set[int]] = {}
+courses_by_days: Dict[str, Set[int]] = {}
+
+# Substring-filtered fields (of CourseLower) -> their trigram index
+_COURSE_TRIGRAMS: Dict[str, Dict[str, Set[int]]] = {
+    "title": courses_by_title,
+    "instructor": courses_by_instructor,
+    "days": courses_by_days,
+}
+
+
+def _derive_course(course: CourseRead) -> Tuple[CourseLower, Dict[str, Any]]:
+    """Shadow and JSON document of `course`; see `_derive_student`."""
+    lc = CourseLower(
+        department_code=course.department_code.lower(),
+        title=course.title.lower(),
+        instructor=course.instructor.lower(),
+        days=course.days.lower(),
+        start_time=course.start_time.lower(),
+        end_time=course.end_time.lower(),
+    )
+    return lc, course.model_dump(mode="json")
+
+
+def _index_course(course: CourseRead, lc: CourseLower, doc: Dict[str, Any]) -> None:
+    key = course.id.int
+    course_docs[key] = doc
+    _course_json.pop(key, None)
+    course_lower[key] = lc
+    add_posting(courses_by_dept, lc.department_code, key)
+    add_posting(courses_by_code, course.course_code, key)
+    add_posting(courses_by_start, lc.start_time, key)
+    add_posting(courses_by_end, lc.end_time, key)
+    for field, index in _COURSE_TRIGRAMS.items():
+        for tg in trigrams(getattr(lc, field)):
+            add_posting(index, tg, key)
+
+
+def _unindex_course(course: CourseRead) -> None:
+    key = course.id.int
+    del course_docs[key]
+    _course_json.pop(key, None)
+    lc = course_lower.pop(key)
+    remove_posting(courses_by_dept, lc.department_code, key)
+    remove_posting(courses_by_code, course.course_code, key)
+    remove_posting(courses_by_start, lc.start_time, key)
+    remove_posting(courses_by_end, lc.end_time, key)
+    for field, index in _COURSE_TRIGRAMS.items():
+        for tg in trigrams(getattr(lc, field)):
+            remove_posting(index, tg, key)
+
+
+_course_filter = FusedFilter(
+    {
+        "title": "title in lc.title",
+        "instructor": "instructor in lc.instructor",
+        "days": "days in lc.days",
+    },
+    {"_lower": course_lower},
+    prelude="lc := _lower[r.id.int]",
+)
+
+_course_columns = SnapshotColumns({
+    "title": lambda r: course_lower[r.id.int].title,
+    "instructor": lambda r: course_lower[r.id.int].instructor,
+    "days": lambda r: course_lower[r.id.int].days,
+})
+
+
+def _changes(update: BaseModel, model: Type[BaseModel]) -> Dict[str, Any]:
+    """Fields explicitly set on a PATCH payload, ready for `model_copy(update=...)`.
+
+    The payload was already validated by FastAPI, so values are taken as-is
+    (nested models stay models); fields whose type on `model` does not admit
+    None may not be nulled out, since `model_copy` would store it unchecked.
+    """
+    changes = {name: getattr(update, name) for name in update.model_fields_set}
+    nulled = [name for name, value in changes.items()
+              if value is None and type(None) not in get_args(model.model_fields[name].annotation)]
+    if nulled:
+        raise HTTPException(status_code=422, detail=f"Fields cannot be null: {', '.join(sorted(nulled))}")
+    return changes
+
 
 app = FastAPI(
     title="Student/Course API",
     description="Demo FastAPI app using Pydantic v2 models for Student and Course",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # -----------------------------------------------------------------------------
 # Courses endpoints
 # -----------------------------------------------------------------------------
 @app.post("/courses", response_model=CourseRead, status_code=201)
-def create_course(course: CourseCreate):
+async def create_course(course: CourseCreate):
+    global _courses_snapshot
     new_id = uuid4()
-    now = datetime.now()
-
-    if new_id in courses:
-        raise HTTPException(status_code=400, detail="Course with this ID already exists")
-
-    courses[new_id] = CourseRead(
-        id=new_id,
-        created_at=now,
-        updated_at=now,
-        **course.model_dump()
-    )
-
-    return courses[new_id]
-
-
-@app.get("/courses", response_model=List[CourseRead])
-def list_courses(
+    key = new_id.int
+    now = now_utc()
+
+    async with _course_writes:
+        if key in courses:
+            raise HTTPException(status_code=400, detail="Course with this ID already exists")
+
+        created = CourseRead(
+            id=new_id,
+            created_at=now,
+            updated_at=now,
+            **course.model_dump()
+        )
+        derived = _derive_course(created)
+
+        courses[key] = created
+        _index_course(created, *derived)
+        course_positions[key] = len(_courses_snapshot)
+        previous = _courses_snapshot
+        _courses_snapshot += (created,)
+        _course_columns.append(previous, _courses_snapshot)
+
+        return created
+
+
+# Results are already-validated CourseRead instances, so skip FastAPI's
+# response_model re-validation and return their stored JSON documents;
+# `responses` keeps the schema in the OpenAPI docs.
+@app.get("/courses", response_model=None, responses={200: {"model": List[CourseRead]}})
+async def list_courses(
     department_code: Optional[str] = Query(None, description="Filter by department code"),
     course_code: Optional[str] = Query(None, description="Filter by course id"),
     title: Optional[str] = Query(None, description="Filter by course title"),
@@ -58,71 +329,120 @@ def list_courses(
     start_time: Optional[str] = Query(None, description="Filter by start time"),
     end_time: Optional[str] = Query(None, description="Filter by end time"),
 ):
-    results = list(courses.values())
-
+    # Equality filters and the trigrams of substring filters narrow the
+    # candidates; substring matches are then verified on the (much smaller)
+    # candidate set. Substrings shorter than a trigram add no posting.
+    postings: List[Set[int]] = []
     if department_code is not None:
-        results = [c for c in results if c.department_code.lower() == department_code.lower()]
+        postings.append(courses_by_dept.get(department_code.lower(), EMPTY))
     if course_code is not None:
-        results = [c for c in results if c.course_code == course_code]
-    if title is not None:
-        results = [c for c in results if title.lower() in c.title.lower()]
-    if instructor is not None:
-        results = [c for c in results if instructor.lower() in c.instructor.lower()]
-    if days is not None:
-        results = [c for c in results if days.lower() in c.days.lower()]
+        postings.append(courses_by_code.get(course_code, EMPTY))
     if start_time is not None:
-        results = [c for c in results if c.start_time.lower() == start_time.lower()]
+        postings.append(courses_by_start.get(start_time.lower(), EMPTY))
     if end_time is not None:
-        results = [c for c in results if c.end_time.lower() == end_time.lower()]
-
-    return results
+        postings.append(courses_by_end.get(end_time.lower(), EMPTY))
+    contains = {
+        "title": title and title.lower(),
+        "instructor": instructor and instructor.lower(),
+        "days": days and days.lower(),
+    }
+    for field, query in contains.items():
+        if query is not None:
+            index = _COURSE_TRIGRAMS[field]
+            postings.extend(index.get(tg, EMPTY) for tg in trigrams(query))
+
+    # The stages are chained iterators: rows flow through every filter in a
+    # single pass, and only the final document list is materialized.
+    snapshot = _courses_snapshot
+    rows = None
+    if postings:
+        rows = _in_snapshot_order(snapshot, course_positions, intersect(postings))
+    elif len(snapshot) >= VECTORIZE_MIN_ROWS:
+        # nothing indexable (e.g. only short substrings): scan NumPy columns instead
+        rows = _course_columns.select(snapshot, contains=contains)
+        if rows is not None:
+            contains = {}
+    if rows is None:
+        rows = snapshot
+
+    matches = _course_filter(**contains)
+    if matches is not None:
+        rows = filter(matches, rows)
+
+    return ORJSONResponse([course_docs[c.id.int] for c in rows])
 
 @app.get("/courses/{course_id}", response_model=CourseRead)
-def get_course(course_id: UUID):
-    if course_id not in courses:
+async def get_course(course_id: UUID):
+    key = course_id.int
+    if key not in courses:
         raise HTTPException(status_code=404, detail="Course not found")
-    return courses[course_id]
+    return _json_response(_course_json, course_docs, key)
 
 @app.patch("/courses/{course_id}", response_model=CourseRead)
-def update_course(course_id: UUID, update: CourseUpdate):
-    if course_id not in courses:
-        raise HTTPException(status_code=404, detail="Course not found")
-
-    now = datetime.now(timezone.utc)
-    stored = courses[course_id].model_dump()
-    stored.update(update.model_dump(exclude_unset=True))
-    stored["updated_at"] = now
-    courses[course_id] = CourseRead( **stored)
-    return courses[course_id]
+async def update_course(course_id: UUID, update: CourseUpdate):
+    global _courses_snapshot
+    key = course_id.int
+    async with _course_writes:
+        if key not in courses:
+            raise HTTPException(status_code=404, detail="Course not found")
+
+        now = now_utc()
+        updated = courses[key].model_copy(update={**_changes(update, CourseRead), "updated_at": now})
+        derived = _derive_course(updated)
+
+        _unindex_course(courses[key])
+        previous = _courses_snapshot
+        _courses_snapshot = _replace(previous, course_positions[key], updated)
+        courses[key] = updated
+        _index_course(updated, *derived)
+        _course_columns.replace(previous, _courses_snapshot, course_positions[key])
+        return updated
 
 @app.delete("/courses/{course_id}", response_model=CourseRead)
-def delete_course(course_id: UUID):
-    if course_id not in courses:
-        raise HTTPException(status_code=404, detail="Course not found")
-    course_to_delete = courses[course_id]
-    del courses[course_id]
-    return course_to_delete
+async def delete_course(course_id: UUID):
+    global _courses_snapshot
+    key = course_id.int
+    async with _course_writes:
+        if key not in courses:
+            raise HTTPException(status_code=404, detail="Course not found")
+        course_to_delete = courses[key]
+        del courses[key]
+        _unindex_course(course_to_delete)
+        _courses_snapshot = _remove(_courses_snapshot, course_positions, key)
+        _course_columns.reset()
+        return course_to_delete
 
 # -----------------------------------------------------------------------------
 # Student endpoints
 # -----------------------------------------------------------------------------
 @app.post("/students", response_model=StudentRead, status_code=201)
-def create_student(student: StudentCreate):
+async def create_student(student: StudentCreate):
+    global _students_snapshot
     new_id = uuid4()
-
-    if new_id in courses:
-        raise HTTPException(status_code=400, detail="Student with this ID already exists")
-
-    now = datetime.now(timezone.utc)
-    students[new_id] = StudentRead(
-        id=new_id,
-        created_at=now,
-        updated_at=now,
-        **student.model_dump())
-    return students[new_id]
-
-@app.get("/students", response_model=List[StudentRead])
-def list_students(
+    key = new_id.int
+
+    async with _student_writes:
+        if key in students:
+            raise HTTPException(status_code=400, detail="Student with this ID already exists")
+
+        now = now_utc()
+        created = StudentRead(
+            id=new_id,
+            created_at=now,
+            updated_at=now,
+            **student.model_dump())
+        derived = _derive_student(created)
+
+        students[key] = created
+        _index_student(created, *derived)
+        student_positions[key] = len(_students_snapshot)
+        previous = _students_snapshot
+        _students_snapshot += (created,)
+        _student_columns.append(previous, _students_snapshot)
+        return created
+
+@app.get("/students", response_model=None, responses={200: {"model": List[StudentRead]}})
+async def list_students(
     uni: Optional[str] = Query(None, description="Filter by Columbia UNI"),
     first_name: Optional[str] = Query(None, description="Filter by first name"),
     last_name: Optional[str] = Query(None, description="Filter by last name"),
@@ -134,64 +454,85 @@ def list_students(
     department_code: Optional[str] = Query(None, description="Filter by department code of at least one course"),
     instructor: Optional[str] = Query(None, description="Filter by instructor of at least one course"),
 ):
-    results = list(students.values())
-
-    if uni is not None:
-        results = [s for s in results if s.uni.lower() == uni.lower()]
-    if first_name is not None:
-        results = [s for s in results if s.first_name.lower() == first_name.lower()]
-    if last_name is not None:
-        results = [s for s in results if s.last_name.lower() == last_name.lower()]
-    if major is not None:
-        results = [s for s in results if s.major.lower() == major.lower()]
-    if grade is not None:
-        results = [s for s in results if s.grade.lower() == grade.lower()]
-    if email is not None:
-        results = [s for s in results if s.email == email]
-    if phone is not None:
-        results = [s for s in results if s.phone == phone]
-    if birth_date is not None:
-        results = [s for s in results if str(s.birth_date) == birth_date]
-
-    # nested address filtering
+    # nested course filters are answered by the reverse indexes
+    postings: List[Set[int]] = []
     if department_code is not None:
-        results = [s for s in results if any(course.department_code.lower() == department_code.lower() for course in s.courses)]
+        postings.append(students_by_dept.get(department_code.lower(), EMPTY))
     if instructor is not None:
-        results = [s for s in results if any(course.instructor.lower() == instructor.lower() for course in s.courses)]
-
-    return results
+        postings.append(students_by_instructor.get(instructor.lower(), EMPTY))
+
+    equals = {
+        "uni": uni and uni.lower(),
+        "first_name": first_name and first_name.lower(),
+        "last_name": last_name and last_name.lower(),
+        "major": major and major.lower(),
+        "grade": grade and grade.lower(),
+        "email": email,
+    }
+    snapshot = _students_snapshot
+    rows = None
+    if postings:
+        rows = _in_snapshot_order(snapshot, student_positions, intersect(postings))
+    elif len(snapshot) >= VECTORIZE_MIN_ROWS:
+        rows = _student_columns.select(snapshot, equals=equals)
+        if rows is not None:
+            equals = {}
+    if rows is None:
+        rows = snapshot
+
+    matches = _student_filter(**equals, phone=phone, birth_date=birth_date)
+    if matches is not None:
+        rows = filter(matches, rows)
+
+    return ORJSONResponse([student_docs[s.id.int] for s in rows])
 
 @app.get("/students/{student_id}", response_model=StudentRead)
-def get_student(student_id: UUID):
-    if student_id not in students:
+async def get_student(student_id: UUID):
+    key = student_id.int
+    if key not in students:
         raise HTTPException(status_code=404, detail="Student not found")
-    return students[student_id]
+    return _json_response(_student_json, student_docs, key)
 
 @app.patch("/students/{student_id}", response_model=StudentRead)
-def update_student(student_id: UUID, update: StudentUpdate):
-    if student_id not in students:
-        raise HTTPException(status_code=404, detail="Student not found")
-
-    now = datetime.now(timezone.utc)
-    stored = students[student_id].model_dump()
-    stored.update(update.model_dump(exclude_unset=True))
-    stored['updated_at'] = now
-    students[student_id] = StudentRead(**stored)
-    return students[student_id]
+async def update_student(student_id: UUID, update: StudentUpdate):
+    global _students_snapshot
+    key = student_id.int
+    async with _student_writes:
+        if key not in students:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+        now = now_utc()
+        updated = students[key].model_copy(
+            update={**_changes(update, StudentRead), "updated_at": now}
+        )
+        derived = _derive_student(updated)
+
+        previous = _students_snapshot
+        _students_snapshot = _replace(previous, student_positions[key], updated)
+        students[key] = updated
+        _index_student(updated, *derived)
+        _student_columns.replace(previous, _students_snapshot, student_positions[key])
+        return updated
 
 @app.delete("/students/{student_id}", response_model=StudentRead)
-def delete_student(student_id: UUID):
-    if student_id not in students:
-        raise HTTPException(status_code=404, detail="Student not found")
-    student_to_delete = students[student_id]
-    del students[student_id]
-    return student_to_delete
+async def delete_student(student_id: UUID):
+    global _students_snapshot
+    key = student_id.int
+    async with _student_writes:
+        if key not in students:
+            raise HTTPException(status_code=404, detail="Student not found")
+        student_to_delete = students[key]
+        del students[key]
+        _unindex_student(key)
+        _students_snapshot = _remove(_students_snapshot, student_positions, key)
+        _student_columns.reset()
+        return student_to_delete
 
 # -----------------------------------------------------------------------------
 # Root
 # -----------------------------------------------------------------------------
 @app.get("/")
-def root():
+async def root():
     return {"message": "Welcome to the Student/Course API. See /docs for OpenAPI UI."}
 
 # -----------------------------------------------------------------------------
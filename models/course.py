@@ -5,6 +5,37 @@ from uuid import UUID
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+# OpenAPI examples, built once and shared by every model config that shows them
+COURSE_EXAMPLE = {
+    "department_code": "COMS",
+    "course_code": "4153",
+    "title": "Cloud Computing",
+    "instructor": "Donald Ferguson",
+    "days": "F",
+    "start_time": "1:10PM",
+    "end_time": "3:45PM",
+    "location": "501 NORTHWEST CORNER",
+    "size": 100,
+    "credit": 3,
+    "section": "001",
+    "enrollment": 102,
+}
+
+NEW_COURSE_EXAMPLE = {
+    "department_code": "COMS",
+    "course_code": "4776",
+    "title": "Neural Networks & Deep Learning",
+    "instructor": "Richard Zemel",
+    "days": "TT",
+    "start_time": "2:40PM",
+    "end_time": "3:55PM",
+    "location": "833 SEELEY W. MUDD BUILDING",
+    "size": 120,
+    "credit": 3,
+    "section": "001",
+    "enrollment": None,
+}
+
 class CourseBase(BaseModel):
     department_code: str = Field(
         ...,
@@ -68,22 +99,7 @@ class CourseBase(BaseModel):
     )
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "department_code": "COMS",
-                    "course_code": "4153",
-                    "title": "Cloud Computing",
-                    "instructor": "Donald Ferguson",
-                    "days": "F",
-                    "start_time": "1:10PM",
-                    "end_time": "3:45PM",
-                    "location": "501 NORTHWEST CORNER",
-                    "size": 100,
-                    "credit": 3,
-                    "section": "001",
-                    "enrollment": 102,
-                }
-            ]
+            "examples": [COURSE_EXAMPLE]
         }
     }
 
@@ -91,22 +107,7 @@ class CourseCreate(CourseBase):
     """ID and created_at are generated on the server side"""
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "department_code": "COMS",
-                    "course_code": "4776",
-                    "title": "Neural Networks & Deep Learning",
-                    "instructor": "Richard Zemel",
-                    "days": "TT",
-                    "start_time": "2:40PM",
-                    "end_time": "3:55PM",
-                    "location": "833 SEELEY W. MUDD BUILDING",
-                    "size": 120,
-                    "credit": 3,
-                    "section": "001",
-                    "enrollment": None,
-                }
-            ]
+            "examples": [NEW_COURSE_EXAMPLE]
         }
     }
 
@@ -177,20 +178,7 @@ class CourseUpdate(BaseModel):
     model_config = {
         "json_schema_extra": {
             "examples": [
-                {
-                    "department_code": "COMS",
-                    "course_code": "4776",
-                    "title": "Neural Networks & Deep Learning",
-                    "instructor": "Richard Zemel",
-                    "days": "TT",
-                    "start_time": "2:40PM",
-                    "end_time": "3:55PM",
-                    "location": "833 SEELEY W. MUDD BUILDING",
-                    "size": 120,
-                    "credit": 3,
-                    "section": "001",
-                    "enrollment": None,
-                },
+                NEW_COURSE_EXAMPLE,
                 {
                     "days": "MW",
                 },
@@ -217,22 +205,12 @@ class CourseRead(CourseBase):
     )
 
     model_config = {
+        "frozen": True,
         "json_schema_extra": {
             "examples": [
                 {
                     "id": "11111111-1111-4111-8111-111111111111",
-                    "department_code": "COMS",
-                    "course_code": "4776",
-                    "title": "Neural Networks & Deep Learning",
-                    "instructor": "Richard Zemel",
-                    "days": "TT",
-                    "start_time": "2:40PM",
-                    "end_time": "3:55PM",
-                    "location": "833 SEELEY W. MUDD BUILDING",
-                    "size": 120,
-                    "credit": 3,
-                    "section": "001",
-                    "enrollment": None,
+                    **NEW_COURSE_EXAMPLE,
                     "created_at": "2025-01-15T10:20:30Z",
                     "updated_at": "2025-01-16T12:00:00Z",
                 }
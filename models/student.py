@@ -3,12 +3,46 @@ from __future__ import annotations
 from typing import Optional, List, Annotated
 from uuid import UUID
 from datetime import date, datetime
-from pydantic import BaseModel, Field, EmailStr, StringConstraints
+from pydantic import AfterValidator, BaseModel, Field, EmailStr, WithJsonSchema
 
-from .course import CourseBase
+from .course import COURSE_EXAMPLE, CourseBase
 
 # Columbia UNI: 2–3 lowercase letters + 1–4 digits (e.g., abc1234)
-UNIType = Annotated[str, StringConstraints(pattern=r"^[a-z]{2,3}\d{1,4}$")]
+_UNI_PATTERN = r"^[a-z]{2,3}\d{1,4}$"
+
+# Byte -> character class ("a" letter, "0" digit, "x" anything else); a UNI
+# is valid iff its class string is one of the few allowed shapes.
+_UNI_CLASSES = bytes(
+    ord("a") if 0x61 <= b <= 0x7A else ord("0") if 0x30 <= b <= 0x39 else ord("x")
+    for b in range(256)
+)
+_UNI_SHAPES = frozenset(b"a" * letters + b"0" * digits for letters in (2, 3) for digits in (1, 2, 3, 4))
+
+
+def _check_uni(value: str) -> str:
+    if not value.isascii() or value.encode("ascii").translate(_UNI_CLASSES) not in _UNI_SHAPES:
+        raise ValueError("UNI must be 2–3 lowercase letters followed by 1–4 digits")
+    return value
+
+
+UNIType = Annotated[
+    str,
+    AfterValidator(_check_uni),
+    WithJsonSchema({"type": "string", "pattern": _UNI_PATTERN}),
+]
+
+STUDENT_EXAMPLE = {
+    "uni": "abc1234",
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "email": "ada@example.com",
+    "major": "Computer Science",
+    "grade": "Senior",
+    "phone": "+1-212-555-0199",
+    "birth_date": "1815-12-10",
+    "courses": [COURSE_EXAMPLE],
+}
+
 
 class StudentBase(BaseModel):
     uni: UNIType = Field(
@@ -56,56 +90,12 @@ class StudentBase(BaseModel):
     courses: List[CourseBase] = Field(
         default_factory=list,
         description="Courses registered to this person for the current semester.",
-        json_schema_extra={
-            "example": [
-                {
-                    "department_code": "COMS",
-                    "course_code": "4153",
-                    "title": "Cloud Computing",
-                    "instructor": "Donald Ferguson",
-                    "days": "F",
-                    "start_time": "1:10PM",
-                    "end_time": "3:45PM",
-                    "location": "501 NORTHWEST CORNER",
-                    "size": 100,
-                    "credit": 3,
-                    "section": "001",
-                    "enrollment": 102,
-                }
-            ]
-        },
+        json_schema_extra={"example": [COURSE_EXAMPLE]},
     )
 
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "uni": "abc1234",
-                    "first_name": "Ada",
-                    "last_name": "Lovelace",
-                    "email": "ada@example.com",
-                    "major": "Computer Science",
-                    "grade": "Senior",
-                    "phone": "+1-212-555-0199",
-                    "birth_date": "1815-12-10",
-                    "courses": [
-                        {
-                            "department_code": "COMS",
-                            "course_code": "4153",
-                            "title": "Cloud Computing",
-                            "instructor": "Donald Ferguson",
-                            "days": "F",
-                            "start_time": "1:10PM",
-                            "end_time": "3:45PM",
-                            "location": "501 NORTHWEST CORNER",
-                            "size": 100,
-                            "credit": 3,
-                            "section": "001",
-                            "enrollment": 102,
-                        }
-                    ],
-                }
-            ]
+            "examples": [STUDENT_EXAMPLE]
         }
     }
 
@@ -113,34 +103,7 @@ class StudentBase(BaseModel):
 class StudentCreate(StudentBase):
     model_config = {
         "json_schema_extra": {
-            "examples": [
-                {
-                    "uni": "abc1234",
-                    "first_name": "Ada",
-                    "last_name": "Lovelace",
-                    "email": "ada@example.com",
-                    "major": "Computer Science",
-                    "grade": "Senior",
-                    "phone": "+1-212-555-0199",
-                    "birth_date": "1815-12-10",
-                    "courses": [
-                        {
-                            "department_code": "COMS",
-                            "course_code": "4153",
-                            "title": "Cloud Computing",
-                            "instructor": "Donald Ferguson",
-                            "days": "F",
-                            "start_time": "1:10PM",
-                            "end_time": "3:45PM",
-                            "location": "501 NORTHWEST CORNER",
-                            "size": 100,
-                            "credit": 3,
-                            "section": "001",
-                            "enrollment": 102,
-                        }
-                    ],
-                }
-            ]
+            "examples": [STUDENT_EXAMPLE]
         }
     }
 
@@ -185,24 +148,7 @@ class StudentUpdate(BaseModel):
     courses: Optional[List[CourseBase]] = Field(
         None,
         description="Replace the entire set of courses with this list.",
-        json_schema_extra={
-            "example": [
-                {
-                    "department_code": "COMS",
-                    "course_code": "4153",
-                    "title": "Cloud Computing",
-                    "instructor": "Donald Ferguson",
-                    "days": "F",
-                    "start_time": "1:10PM",
-                    "end_time": "3:45PM",
-                    "location": "501 NORTHWEST CORNER",
-                    "size": 100,
-                    "credit": 3,
-                    "section": "001",
-                    "enrollment": 102,
-                }
-            ]
-        },
+        json_schema_extra={"example": [COURSE_EXAMPLE]},
     )
 
     model_config = {
@@ -211,22 +157,7 @@ class StudentUpdate(BaseModel):
                 {"first_name": "Ada", "last_name": "Byron"},
                 {"phone": "+1-415-555-0199"},
                 {
-                    "courses": [
-                        {
-                            "department_code": "COMS",
-                            "course_code": "4153",
-                            "title": "Cloud Computing",
-                            "instructor": "Donald Ferguson",
-                            "days": "F",
-                            "start_time": "1:10PM",
-                            "end_time": "3:45PM",
-                            "location": "501 NORTHWEST CORNER",
-                            "size": 100,
-                            "credit": 3,
-                            "section": "001",
-                            "enrollment": 102,
-                        }
-                    ]
+                    "courses": [COURSE_EXAMPLE]
                 },
             ]
         }
@@ -252,34 +183,12 @@ class StudentRead(StudentBase):
     )
 
     model_config = {
+        "frozen": True,
         "json_schema_extra": {
             "examples": [
                 {
                     "id": "99999999-9999-4999-8999-999999999999",
-                    "uni": "abc1234",
-                    "first_name": "Ada",
-                    "last_name": "Lovelace",
-                    "email": "ada@example.com",
-                    "major": "Computer Science",
-                    "grade": "Senior",
-                    "phone": "+1-212-555-0199",
-                    "birth_date": "1815-12-10",
-                    "courses": [
-                        {
-                            "department_code": "COMS",
-                            "course_code": "4153",
-                            "title": "Cloud Computing",
-                            "instructor": "Donald Ferguson",
-                            "days": "F",
-                            "start_time": "1:10PM",
-                            "end_time": "3:45PM",
-                            "location": "501 NORTHWEST CORNER",
-                            "size": 100,
-                            "credit": 3,
-                            "section": "001",
-                            "enrollment": 102,
-                        }
-                    ],
+                    **STUDENT_EXAMPLE,
                     "created_at": "2025-01-15T10:20:30Z",
                     "updated_at": "2025-01-16T12:00:00Z",
                 }
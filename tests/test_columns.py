@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+from utils.columns import SnapshotColumns
+from utils.predicate import FusedFilter
+
+# Control characters (NUL included) are where NumPy strings diverge from str.
+ALPHABET = "ab \x00\x01\t\n\x7fé"
+
+
+def _word(rng: random.Random, longest: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, longest)))
+
+
+def _snapshot(rng: random.Random, rows: int = 300) -> tuple:
+    return tuple(SimpleNamespace(name=_word(rng, 4), title=_word(rng, 8)) for _ in range(rows))
+
+
+def test_select_matches_predicate_path():
+    rng = random.Random(0)
+    columns = SnapshotColumns({"name": lambda r: r.name, "title": lambda r: r.title})
+    predicate = FusedFilter({"name": "name == r.name", "title": "title in r.title"}, {})
+    snapshot = _snapshot(rng)
+    queries = [_word(rng, 3) for _ in range(300)] + ["\x00", "a\x00", "\x00\x00", ""]
+    for query in queries:
+        for equals, contains in (({"name": query}, {}), ({}, {"title": query}), ({"name": query}, {"title": query[:1]})):
+            expected = [r for r in snapshot if predicate(**equals, **contains)(r)]
+            selected = columns.select(snapshot, equals=equals, contains=contains)
+            if selected is None:
+                assert "\x00" in query, repr(query)
+                continue
+            assert list(selected) == expected, (repr(query), equals, contains)
+
+
+def test_long_values_do_not_pad_the_column():
+    snapshot = tuple(SimpleNamespace(title="t") for _ in range(10_000)) + (SimpleNamespace(title="x" * 10_000),)
+    columns = SnapshotColumns({"title": lambda r: r.title})
+    assert columns.column(snapshot, "title").nbytes < 1_000_000
+    assert list(columns.select(snapshot, contains={"title": "xx"})) == [snapshot[-1]]
+
+
+def test_columns_follow_writes_like_a_fresh_build():
+    rng = random.Random(1)
+    extract = {"name": lambda r: r.name, "title": lambda r: r.title}
+    columns = SnapshotColumns(extract)
+    snapshot = _snapshot(rng, rows=5)
+    columns.column(snapshot, "name")
+    for _ in range(200):
+        previous = snapshot
+        record = SimpleNamespace(name=_word(rng, 4), title=_word(rng, 8))
+        if rng.random() < 0.6 or not snapshot:
+            snapshot = previous + (record,)
+            columns.append(previous, snapshot)
+        else:
+            position = rng.randrange(len(snapshot))
+            snapshot = previous[:position] + (record,) + previous[position + 1:]
+            columns.replace(previous, snapshot, position)
+        for name in ("name", "title"):
+            fresh = SnapshotColumns(extract).column(snapshot, name)
+            assert columns.column(snapshot, name).tolist() == fresh.tolist()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from main import app
+
+client = TestClient(app)
+
+COURSE = {
+    "department_code": "COMS",
+    "course_code": "4153",
+    "title": "Cloud Computing",
+    "instructor": "Donald Ferguson",
+    "days": "F",
+    "start_time": "1:10PM",
+    "end_time": "3:45PM",
+    "location": "501 NORTHWEST CORNER",
+    "size": 100,
+    "credit": 3,
+}
+
+STUDENT = {
+    "uni": "abc1234",
+    "first_name": "Ada",
+    "last_name": "Lovelace",
+    "major": "Computer Science",
+    "grade": "Senior",
+    "email": "ada@example.com",
+    "courses": [COURSE],
+}
+
+
+def test_patch_rejects_null_for_non_nullable_fields():
+    created = client.post("/students", json=STUDENT).json()
+    url = f"/students/{created['id']}"
+
+    for field in ("courses", "first_name"):
+        response = client.patch(url, json={field: None})
+        assert response.status_code == 422, response.text
+
+    assert client.get(url).json() == created
+    response = client.patch(url, json={"phone": None, "major": "Mathematics"})
+    assert response.status_code == 200, response.text
+    assert response.json()["phone"] is None
+    assert client.get(url).json() == response.json()
+    listed = client.get("/students", params={"department_code": "coms", "major": "mathematics"}).json()
+    assert [s["id"] for s in listed] == [created["id"]]
+    client.delete(url)
+
+
+def test_patch_course_rejects_null_for_required_fields():
+    created = client.post("/courses", json=COURSE).json()
+    url = f"/courses/{created['id']}"
+
+    assert client.patch(url, json={"title": None}).status_code == 422
+    response = client.patch(url, json={"section": None, "size": 5})
+    assert response.status_code == 200, response.text
+    assert client.get(url).json() == response.json()
+    client.delete(url)
+
+
+def test_failed_derivation_leaves_the_course_untouched(monkeypatch):
+    import main
+
+    created = client.post("/courses", json=COURSE).json()
+    url = f"/courses/{created['id']}"
+    snapshot = main._courses_snapshot
+
+    def fail(course):
+        raise RuntimeError("derive failed")
+
+    monkeypatch.setattr(main, "_derive_course", fail)
+    try:
+        client.patch(url, json={"title": "Distributed Systems"})
+    except RuntimeError:
+        pass
+    monkeypatch.undo()
+
+    assert main._courses_snapshot is snapshot
+    assert client.get(url).json() == created
+    assert [c["id"] for c in client.get("/courses", params={"title": "cloud"}).json()] == [created["id"]]
+    assert client.get("/courses", params={"title": "distributed"}).json() == []
+    client.delete(url)
+
+
+def test_index_and_scan_paths_list_in_the_same_order(monkeypatch):
+    import main
+
+    # identical, then backwards, creation timestamps must not reorder results
+    now = main.now_utc()
+    stamps = iter([now] * 3 + [now.replace(year=2000)] * 2)
+    monkeypatch.setattr(main, "now_utc", lambda: next(stamps, now))
+    ids = [client.post("/courses", json={**COURSE, "title": f"Cloud {n}"}).json()["id"] for n in range(5)]
+    client.delete(f"/courses/{ids.pop(1)}")
+    client.patch(f"/courses/{ids[2]}", json={"size": 5})
+
+    def listed(**params):
+        return [c["id"] for c in client.get("/courses", params=params).json() if c["id"] in ids]
+
+    assert listed(title="cloud") == listed(title="cl") == listed() == ids
+    for key in ids:
+        client.delete(f"/courses/{key}")
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+_UTC = timezone.utc
+
+
+def now_utc() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(_UTC)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+# Below this many rows the fused Python predicate beats building/scanning arrays.
+VECTORIZE_MIN_ROWS = 10_000
+
+# Variable-width strings: each row costs its own length, not the column's longest.
+_STRING = np.dtypes.StringDType()
+
+
+class SnapshotColumns:
+    """NumPy string columns aligned with a store snapshot, for vectorized scans.
+
+    `extract` maps each column name to a function returning that (non-null,
+    string) column value for a record. Columns are built lazily, the first
+    time a snapshot is scanned on that column. Writers then keep them in step
+    with each new snapshot: `append` after a create, `replace` after an
+    update, and `reset` after a delete, which leaves the next scan to rebuild.
+    Columns found out of step with the snapshot being scanned are rebuilt.
+
+    NumPy truncates NUL characters in substring patterns, so `select`
+    declines (returns None) any query containing one; callers then fall
+    back to the Python predicate.
+    """
+
+    def __init__(self, extract: Dict[str, Callable[[Any], str]]):
+        self._extract = extract
+        self._snapshot: Optional[tuple] = None
+        # arrays over-allocate so appends are amortized; rows past _size are unused
+        self._columns: Dict[str, np.ndarray] = {}
+        self._size = 0
+
+    def reset(self) -> None:
+        self._snapshot = None
+        self._columns = {}
+        self._size = 0
+
+    def append(self, previous: tuple, snapshot: tuple) -> None:
+        """Follow the swap from `previous` to `snapshot`, which adds one record at the end."""
+        if previous is not self._snapshot:
+            self.reset()
+            return
+        record = snapshot[-1]
+        for name, array in self._columns.items():
+            if len(array) == self._size:
+                grown = np.empty(max(2 * len(array), 16), dtype=_STRING)
+                grown[:self._size] = array
+                array = self._columns[name] = grown
+            array[self._size] = self._extract[name](record)
+        self._size += 1
+        self._snapshot = snapshot
+
+    def replace(self, previous: tuple, snapshot: tuple, position: int) -> None:
+        """Follow the swap from `previous` to `snapshot`, which changes the record at `position`."""
+        if previous is not self._snapshot:
+            self.reset()
+            return
+        record = snapshot[position]
+        for name, array in self._columns.items():
+            array[position] = self._extract[name](record)
+        self._snapshot = snapshot
+
+    def column(self, snapshot: tuple, name: str) -> np.ndarray:
+        if snapshot is not self._snapshot:
+            self.reset()
+            self._snapshot = snapshot
+            self._size = len(snapshot)
+        array = self._columns.get(name)
+        if array is None:
+            get = self._extract[name]
+            array = self._columns[name] = np.array([get(r) for r in snapshot], dtype=_STRING)
+        return array[:self._size]
+    def select(
+        self,
+        snapshot: tuple,
+        equals: Optional[Dict[str, Optional[str]]] = None,
+        contains: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Optional[Iterable[Any]]:
+        """Records of `snapshot` matching every non-None equality/substring filter, lazily.
+
+        Returns None if a query value cannot be matched faithfully here.
+        """
+        equals = {name: value for name, value in (equals or {}).items() if value is not None}
+        contains = {name: value for name, value in (contains or {}).items() if value is not None}
+        if any("\0" in value for value in (*equals.values(), *contains.values())):
+            return None
+        mask = None
+        for name, value in equals.items():
+            # compare against a StringDType array, not a str scalar NumPy would coerce
+            hit = self.column(snapshot, name) == np.array(value, dtype=_STRING)
+            mask = hit if mask is None else mask & hit
+        for name, value in contains.items():
+            hit = np.strings.find(self.column(snapshot, name), np.array(value, dtype=_STRING)) >= 0
+            mask = hit if mask is None else mask & hit
+        if mask is None:
+            return snapshot
+        return map(snapshot.__getitem__, np.flatnonzero(mask).tolist())
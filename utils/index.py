@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import Dict, Hashable, Iterable, Set
+
+# Shared empty posting for lookups that miss; never mutate it.
+EMPTY: frozenset = frozenset()
+
+
+def add_posting(index: Dict[str, Set[Hashable]], term: str, key: Hashable) -> None:
+    """Record that `key` has `term`."""
+    index.setdefault(term, set()).add(key)
+
+
+def remove_posting(index: Dict[str, Set[Hashable]], term: str, key: Hashable) -> None:
+    """Forget that `key` has `term`, dropping the posting once it is empty."""
+    posting = index.get(term)
+    if posting is None:
+        return
+    posting.discard(key)
+    if not posting:
+        del index[term]
+
+
+def trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of `text` (empty when shorter than 3)."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def intersect(postings: Iterable[Set[Hashable]]) -> Set[Hashable]:
+    """Intersect postings, starting from the rarest one."""
+    ordered = sorted(postings, key=len)
+    if not ordered:
+        return set()
+    result = set(ordered[0])
+    for posting in ordered[1:]:
+        if not result:
+            break
+        result &= posting
+    return result
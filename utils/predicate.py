@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class FusedFilter:
+    """One-pass row predicate generated for the filters a request actually uses.
+
+    `terms` maps each filter name to a boolean expression over the row `r`
+    in which the filter name itself stands for the query value, e.g.
+    ``{"title": "title in lc.title"}``. `prelude`, if given, is an
+    assignment expression evaluated once per row before the terms (e.g.
+    ``"lc := _lower[r.id.int]"``); `namespace` supplies its globals.
+
+    The `and`-joined source for each combination of active filters is
+    compiled once and cached; query values are bound as closure variables,
+    never spliced into the source.
+    """
+
+    def __init__(self, terms: Dict[str, str], namespace: Dict[str, Any], prelude: Optional[str] = None):
+        self._terms = terms
+        self._namespace = namespace
+        self._prelude = prelude
+        self._factory = lru_cache(maxsize=None)(self._compile)
+
+    def _compile(self, names: Tuple[str, ...]) -> Callable[..., Callable[[Any], bool]]:
+        body = " and ".join(f"({self._terms[name]})" for name in names)
+        if self._prelude is not None:
+            body = f"(({self._prelude}) or True) and {body}"
+        source = f"def factory({', '.join(names)}):\n    return lambda r: {body}\n"
+        namespace = dict(self._namespace)
+        exec(compile(source, f"<filter {'+'.join(names)}>", "exec"), namespace)
+        return namespace["factory"]
+
+    def __call__(self, **values: Any) -> Optional[Callable[[Any], bool]]:
+        """Predicate for the non-None `values`, or None when no filter is active."""
+        active = {name: value for name, value in values.items() if value is not None}
+        if not active:
+            return None
+        return self._factory(tuple(sorted(active)))(**active)